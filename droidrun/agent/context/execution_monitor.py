@@ -32,6 +32,8 @@ class ExecutionMonitor:
         self.execution_history: List[Dict] = []
         self.performance_metrics: Dict[str, Any] = {}
         self.step_start_time: Optional[float] = None
+        # 单调时钟起点，仅用于计算步骤耗时（不受系统时间调整影响）
+        self._step_start_perf: Optional[float] = None
         self.consecutive_failures: int = 0
         self.max_consecutive_failures: int = 3
         
@@ -40,6 +42,7 @@ class ExecutionMonitor:
     def start_step_monitoring(self, step_data: Dict):
         """开始监控单个步骤"""
         self.step_start_time = time.time()
+        self._step_start_perf = time.perf_counter()
         self.execution_history.append({
             "step": len(self.execution_history) + 1,
             "start_time": self.step_start_time,
@@ -50,9 +53,12 @@ class ExecutionMonitor:
     def monitor_step(self, step_data: Dict) -> MonitorResult:
         """监控单个执行步骤"""
         try:
-            # 计算执行时间 - 修复：使用当前时间而不是step_start_time
-            current_time = time.time()
-            execution_time = current_time - self.step_start_time if self.step_start_time else 0
+            # 计算执行时间：使用单调时钟，避免系统时间调整导致耗时异常
+            execution_time = (
+                time.perf_counter() - self._step_start_perf
+                if self._step_start_perf is not None
+                else 0
+            )
             
             # 如果这是任务完成的情况，不进行超时检查
             if step_data.get("success", False) and step_data.get("steps", 0) > 10:
@@ -337,6 +343,7 @@ class ExecutionMonitor:
         self.execution_history = []
         self.performance_metrics = {}
         self.step_start_time = None
+        self._step_start_perf = None
         self.consecutive_failures = 0
         LoggingUtils.log_info("ExecutionMonitor", "🔄 ExecutionMonitor reset")
 
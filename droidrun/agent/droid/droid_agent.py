@@ -803,7 +803,8 @@ class DroidAgent(Workflow):
             return StopEvent(result)
             
         if self.trajectory and self.save_trajectories != "none":
-            self.trajectory.save_trajectory()
+            # 轨迹落盘（JSON、截图 GIF）为阻塞 I/O，放到线程中执行，避免阻塞事件循环
+            await asyncio.to_thread(self.trajectory.save_trajectory)
 
             # 轨迹保存完成后，保存经验到记忆系统（尽量不阻塞收尾阶段）
             if self.memory_enabled and ev.success:
@@ -1,4 +1,58 @@
 import asyncio
+import threading
+
+try:
+    import uvloop
+except ImportError:  # uvloop is an optional speedup, see the "speedups" extra
+    uvloop = None
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it is installed."""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def run(coro):
+    """
+    Run a coroutine to completion like asyncio.run, on a uvloop loop if available.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        return runner.run(coro)
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared event loop used to run async functions from sync code.
+
+    The loop is created on first use and runs forever on a daemon thread, so
+    wrapped calls do not pay for creating and tearing down a loop each time.
+    """
+    global _background_loop
+    # Fast path once the loop exists: a plain global read, no lock
+    loop = _background_loop
+    if loop is not None:
+        return loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                name="async-to-sync",
+                daemon=True,
+            ).start()
+    return _background_loop
+
 
 def async_to_sync(func):
     """
@@ -12,6 +66,15 @@ def async_to_sync(func):
     """
 
     def wrapper(*args, **kwargs):
-        return asyncio.run(func(*args, **kwargs))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # Blocking here would stall the caller's loop, and deadlock if the
+            # coroutine needs it; asyncio.run refused this case as well
+            raise RuntimeError("async_to_sync cannot be called from a running event loop")
+        loop = _get_background_loop()
+        return asyncio.run_coroutine_threadsafe(func(*args, **kwargs), loop).result()
 
-    return wrapper
\ No newline at end of file
+    return wrapper
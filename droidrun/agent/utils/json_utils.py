@@ -0,0 +1,74 @@
+"""
+JSON helpers that prefer orjson when it is installed.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup, see the "speedups" extra
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse a JSON document, using orjson when available.
+
+    orjson raises ``orjson.JSONDecodeError``, which subclasses
+    ``json.JSONDecodeError``, so callers can keep catching the stdlib error.
+
+    Args:
+        data: JSON text or UTF-8 encoded bytes
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json_file(path: str) -> Any:
+    """
+    Load a JSON file, memory-mapping it when orjson is available.
+
+    With orjson the mapped pages are parsed directly, so large files (e.g.
+    trajectories holding full a11y trees) are not first copied into a
+    Python bytes object. Without orjson the file is read and parsed with
+    the stdlib.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The decoded Python object
+    """
+    with open(path, "rb") as f:
+        # mmap cannot map empty files; let the parser raise the usual error
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def write_json_file(path: str, obj: Any) -> None:
+    """
+    Write an object as indented UTF-8 JSON, using orjson when available.
+
+    The stdlib fallback matches orjson's output style: two-space indent
+    and non-ASCII characters written as-is.
+
+    Args:
+        path: Destination file path
+        obj: JSON-serializable object
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
@@ -3,6 +3,7 @@
 提供一致的日志格式和级别管理
 """
 import logging
+import time
 from typing import Any, Optional
 from functools import wraps
 
@@ -65,11 +66,15 @@ class LoggingUtils:
         """
         统一的调试日志格式
         
+        未启用 DEBUG 级别时直接返回，避免无意义的字符串格式化。
+        
         Args:
             context: 上下文信息（模块/功能）
             message: 日志消息
             **kwargs: 额外的格式化参数
         """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         if kwargs:
             formatted_message = f"[{context}] {message}".format(**kwargs)
         else:
@@ -142,19 +147,20 @@ def log_execution_time(context: str, level: str = "debug"):
         level: 日志级别
     """
     def decorator(func):
+        log_func = getattr(LoggingUtils, f"log_{level}")
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            import time
-            start_time = time.time()
-            log_func = getattr(LoggingUtils, f"log_{level}")
+            # 单调时钟只取一次起点，用于计算耗时
+            start_time = time.perf_counter()
             log_func(context, f"Starting {func.__name__}")
             try:
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 log_func(context, f"Completed {func.__name__} in {execution_time:.2f}s")
                 return result
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 LoggingUtils.log_error(context, f"Failed {func.__name__} after {execution_time:.2f}s: {e}")
                 raise
         return wrapper
@@ -12,6 +12,7 @@ import time
 import uuid
 from typing import Dict, List, Any
 from droidrun.agent.utils.logging_utils import LoggingUtils
+from droidrun.agent.utils.json_utils import load_json_file, write_json_file
 from PIL import Image
 import io
 from llama_index.core.workflow import Event
@@ -234,8 +235,7 @@ class Trajectory:
         os.makedirs(os.path.join(trajectory_folder, "ui_states"), exist_ok=True)
         for idx, ui_state in enumerate(self.ui_states):
             ui_states_path = os.path.join(trajectory_folder, "ui_states", f"{idx}.json")
-            with open(ui_states_path, "w", encoding="utf-8") as f:
-                json.dump(ui_state, f, ensure_ascii=False, indent=2)
+            write_json_file(ui_states_path, ui_state)
         return trajectory_folder
 
     @staticmethod
@@ -260,15 +260,13 @@ class Trajectory:
             # Load main trajectory
             trajectory_json_path = os.path.join(trajectory_folder, "trajectory.json")
             if os.path.exists(trajectory_json_path):
-                with open(trajectory_json_path, "r") as f:
-                    result["trajectory_data"] = json.load(f)
+                result["trajectory_data"] = load_json_file(trajectory_json_path)
                 LoggingUtils.log_info("Trajectory", "Loaded trajectory data from {path}", path=trajectory_json_path)
 
             # Load macro sequence
             macro_json_path = os.path.join(trajectory_folder, "macro.json")
             if os.path.exists(macro_json_path):
-                with open(macro_json_path, "r") as f:
-                    result["macro_data"] = json.load(f)
+                result["macro_data"] = load_json_file(macro_json_path)
                 LoggingUtils.log_info("Trajectory", "Loaded macro data from {path}", path=macro_json_path)
 
             # Check for GIF
@@ -300,8 +298,7 @@ class Trajectory:
             macro_file_path = os.path.join(macro_file_path, "macro.json")
 
         try:
-            with open(macro_file_path, "r") as f:
-                macro_data = json.load(f)
+            macro_data = load_json_file(macro_file_path)
 
             LoggingUtils.log_info("Trajectory", "Loaded macro sequence with {count} actions from {path}", 
                                 count=macro_data.get('total_actions', 0), path=macro_file_path)
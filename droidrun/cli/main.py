@@ -2,7 +2,6 @@
 DroidRun CLI - Command line interface for controlling Android devices through LLM agents.
 """
 
-import asyncio
 import click
 import os
 import logging
@@ -12,6 +11,7 @@ from dotenv import load_dotenv
 from rich.console import Console
 from adbutils import adb
 from droidrun.agent.droid import DroidAgent
+from droidrun.agent.utils import async_utils
 from droidrun.agent.utils.llm_picker import load_llm
 from droidrun.tools import AdbTools, IOSTools
 from droidrun.agent.context.personas import DEFAULT, BIG_AGENT
@@ -66,7 +66,7 @@ def configure_logging(goal: str, debug: bool):
 def coro(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        return asyncio.run(f(*args, **kwargs))
+        return async_utils.run(f(*args, **kwargs))
 
     return wrapper
 
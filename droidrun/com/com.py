@@ -5,7 +5,8 @@
 提供通用的服务端与客户端工具，便于在独立脚本中进行 APP 连接与消息交互测试。
 
 注意：本模块仅依赖标准库，默认实现了旧格式消息（首字节类型 I/X/S/A/E/G）与
-简化版 JSON 格式消息的接收逻辑，发送动作使用 JSON 格式。
+简化版 JSON 格式消息的接收逻辑，发送动作使用 JSON 格式。若环境中安装了 orjson，
+JSON 编解码会自动使用 orjson 加速，线协议不变。
 """
 
 import socket
@@ -17,6 +18,11 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+try:
+    import orjson  # 可选加速依赖，未安装时回退到标准库 json
+except ImportError:
+    orjson = None
+
 
 # -------------------------------
 # 基础工具与常量
@@ -40,6 +46,51 @@ class Message_types:
     action = "action"
 
 
+def _json_dumps(payload: Any) -> bytes:
+    """将对象编码为 UTF-8 JSON 字节（优先使用 orjson）。"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析 UTF-8 JSON 字节（优先使用 orjson），无需先解码为字符串。"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# 动作消息信封的固定前缀（预先编码），发送时只需序列化 action 本身
+_ACTION_ENVELOPE_PREFIX = (
+    json.dumps({"messageType": Message_types.action}, ensure_ascii=False)[:-1] + ', "action": '
+).encode("utf-8")
+
+
+# 单次 sendmsg 提交的缓冲区数量上限（低于常见系统的 IOV_MAX=1024）
+_SENDMSG_MAX_BUFFERS = 512
+
+
+def _sendall_parts(sock: socket.socket, *parts: bytes) -> None:
+    """分段发送数据（scatter-gather），不为拼接头部而复制整个负载。
+
+    参数:
+        sock: 目标套接字
+        *parts: 依次发送的字节片段，如类型字节、长度头与消息体
+    说明:
+    - 优先使用 `sendmsg` 一次提交多个缓冲区，并处理部分发送；
+    - 平台不支持 `sendmsg`（如 Windows）时退化为拼接后 `sendall`。
+    """
+    if not hasattr(sock, "sendmsg"):
+        sock.sendall(b"".join(parts))
+        return
+    views = [memoryview(p) for p in parts if p]
+    while views:
+        sent = sock.sendmsg(views[:_SENDMSG_MAX_BUFFERS])
+        while views and sent >= len(views[0]):
+            sent -= len(views[0])
+            views.pop(0)
+        if views and sent:
+            views[0] = views[0][sent:]
 
 
 def log(msg: str, role: Optional[str] = None):
@@ -127,8 +178,8 @@ class SessionManager:
         if hasattr(self, "_initialized"):
             return
         self._initialized = True
+        # 会话字典的单次 get/set/pop 本身是原子的，无需额外加锁
         self.sessions: Dict[str, ClientSession] = {}
-        self.session_locks: Dict[str, threading.RLock] = {}
         self.running = True
         self.cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
         self.cleanup_thread.start()
@@ -144,8 +195,6 @@ class SessionManager:
             ClientSession: 新会话对象
         """
         session_id = str(uuid.uuid4())
-        lock = threading.RLock()
-        self.session_locks[session_id] = lock
         session = ClientSession(
             session_id=session_id,
             client_socket=client_socket,
@@ -153,9 +202,8 @@ class SessionManager:
             created_at=datetime.now(),
             last_activity=datetime.now(),
         )
-        with lock:
-            self.sessions[session_id] = session
-            log(f"创建新会话: {session_id} from {client_address}", role="server")
+        self.sessions[session_id] = session
+        log(f"创建新会话: {session_id} from {client_address}", role="server")
         return session
 
     def get_session(self, session_id: str) -> Optional[ClientSession]:
@@ -184,16 +232,14 @@ class SessionManager:
         """移除会话并释放资源。"""
         if session_id not in self.sessions:
             return False
-        lock = self.session_locks.get(session_id, threading.RLock())
-        with lock:
-            session = self.sessions.pop(session_id, None)
-            self.session_locks.pop(session_id, None)
-            if session:
-                try:
-                    session.close()
-                except Exception:
-                    pass
-                log(f"移除会话: {session_id}", role="server")
+        # pop 是原子操作，并发移除时只有一个调用方拿到会话并负责关闭
+        session = self.sessions.pop(session_id, None)
+        if session:
+            try:
+                session.close()
+            except Exception:
+                pass
+            log(f"移除会话: {session_id}", role="server")
         return True
 
     def get_active_sessions(self) -> Dict[str, ClientSession]:
@@ -407,9 +453,44 @@ class ComServer:
         参数:
             session: 会话对象
             action: 动作字典，如 {"type": "tap", "x": 100, "y": 200}
+
+        说明:
+        - 外层信封 `{"messageType": "action", ...}` 使用预编码前缀，
+          不再为每个动作构造并序列化外层字典，线上格式保持不变。
         """
-        payload = {"messageType": Message_types.action, "action": action}
-        self._send_json(session.client_socket, payload)
+        try:
+            self._send_body(session.client_socket, self._encode_action(action))
+        except Exception as e:
+            log(f"发送 JSON 异常: {e}", role="server")
+
+    def send_actions(self, session: ClientSession, actions: list) -> None:
+        """向指定会话批量发送多个动作（JSON格式），合并为一次写出。
+
+        参数:
+            session: 会话对象
+            actions: 动作字典列表
+
+        说明:
+        - 每个动作仍是独立的 "J" 帧，APP 端按原协议逐条解析；
+        - 所有帧通过一次分段写（sendmsg）提交，减少连续下发时的系统调用次数。
+        """
+        try:
+            parts = []
+            for action in actions:
+                body = self._encode_action(action)
+                parts.extend((b"J", f"{len(body)}\n".encode("utf-8"), body))
+            if parts:
+                _sendall_parts(session.client_socket, *parts)
+        except Exception as e:
+            log(f"发送 JSON 异常: {e}", role="server")
+
+    def _encode_action(self, action: dict) -> bytes:
+        """将动作编码为完整的动作消息体（预编码信封前缀 + action JSON）。"""
+        return (
+            _ACTION_ENVELOPE_PREFIX
+            + _json_dumps(action)
+            + b"}"
+        )
 
     # 内部方法
     def _accept_loop(self) -> None:
@@ -575,7 +656,7 @@ class ComServer:
             data = client_file.read(length)
             if len(data) != length:
                 return None
-            return json.loads(data.decode("utf-8"))
+            return _json_loads(data)
         except Exception as e:
             log(f"解析 JSON 异常: {e}", role="server")
             return None
@@ -583,12 +664,16 @@ class ComServer:
     def _send_json(self, sock: socket.socket, payload: dict) -> None:
         """以简化 JSON 格式发送消息："J" + 长度 + JSON。"""
         try:
-            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-            header = f"{len(body)}\n".encode("utf-8")
-            sock.sendall(b"J" + header + body)
+            body = _json_dumps(payload)
+            self._send_body(sock, body)
         except Exception as e:
             log(f"发送 JSON 异常: {e}", role="server")
 
+    def _send_body(self, sock: socket.socket, body: bytes) -> None:
+        """发送已编码的 JSON 消息体：补充 "J" + 长度 头部后写出。"""
+        header = f"{len(body)}\n".encode("utf-8")
+        _sendall_parts(sock, b"J", header, body)
+
     def _detect_real_ip(self) -> str:
         """探测本机外网可见 IP（用于提示 APP 连接地址）。"""
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -639,9 +724,9 @@ class ComClient:
         log(f"客户端发送 XML（长度={len(body)}）", role="client")
 
     def send_screenshot(self, content: bytes) -> None:
-        """发送截图消息（旧格式 S）。"""
+        """发送截图消息（旧格式 S），截图字节直接写出，不做拼接复制。"""
         header = f"{len(content)}\n".encode("utf-8")
-        self.sock.sendall(b"S" + header + content)
+        _sendall_parts(self.sock, b"S", header, content)
         log(f"客户端发送截图（长度={len(content)}）", role="client")
 
     def send_error(self, error_text: str) -> None:
@@ -658,7 +743,7 @@ class ComClient:
 
     def send_json(self, payload: dict) -> None:
         """发送简化 JSON 消息。"""
-        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        body = _json_dumps(payload)
         header = f"{len(body)}\n".encode("utf-8")
         self.sock.sendall(b"J" + header + body)
         log(f"客户端发送 JSON（长度={len(body)}）", role="client")
@@ -691,7 +776,7 @@ class ComClient:
                 if data is None:
                     return None
                 try:
-                    return json.loads(data.decode("utf-8"))
+                    return _json_loads(data)
                 except Exception:
                     return {"raw": data.decode("utf-8", errors="ignore")}
             else:
@@ -706,7 +791,7 @@ class ComClient:
                 data = self._recv_exact(length)
                 if data is None:
                     return None
-                return json.loads(data.decode("utf-8"))
+                return _json_loads(data)
         except socket.timeout:
             return None
         except Exception:
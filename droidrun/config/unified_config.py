@@ -59,6 +59,9 @@ class ToolsConfig:
     action_wait_time: float = 0.5
     screenshot_wait_time: float = 1.0
     long_wait_time: float = 2.0
+    
+    # 截图缓存配置（仅保留最近的截图，避免长时间运行时内存持续增长）
+    screenshot_history: int = 32
 
 @dataclass
 class APIConfig:
@@ -139,6 +142,12 @@ class DroidRunUnifiedConfig:
                 LoggingUtils.log_error("UnifiedConfig", "Invalid max_steps: {steps}", steps=self.agent.max_steps)
                 return False
             
+            # 验证工具配置
+            if self.tools.screenshot_history <= 0:
+                LoggingUtils.log_error("UnifiedConfig", "Invalid screenshot_history: {history}", 
+                                     history=self.tools.screenshot_history)
+                return False
+            
             # 验证系统配置
             if self.system.timeout <= 0:
                 LoggingUtils.log_error("UnifiedConfig", "Invalid timeout: {timeout}", timeout=self.system.timeout)
@@ -145,6 +145,7 @@ class UnifiedConfigManager:
 🔧 Tools:
   - Action Wait Time: {self.config.tools.action_wait_time}s
   - Screenshot Wait Time: {self.config.tools.screenshot_wait_time}s
+  - Screenshot History: {self.config.tools.screenshot_history}
 
 🌐 API:
   - Model: {self.config.api.model}
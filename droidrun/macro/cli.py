@@ -2,7 +2,6 @@
 Command-line interface for DroidRun macro replay.
 """
 
-import asyncio
 import click
 import logging
 import os
@@ -10,6 +9,7 @@ from typing import Optional
 from rich.console import Console
 from rich.table import Table
 from droidrun.macro.replay import MacroPlayer, replay_macro_file, replay_macro_folder
+from droidrun.agent.utils import async_utils
 from droidrun.agent.utils.trajectory import Trajectory
 from adbutils import adb
 
@@ -71,7 +71,7 @@ def replay(path: str, device: Optional[str], delay: float, start_from: int, max_
     else:
         logger.info(f"📱 Using device: {device}")
     
-    asyncio.run(_replay_async(path, device, delay, start_from_zero, max_steps, dry_run, logger))
+    async_utils.run(_replay_async(path, device, delay, start_from_zero, max_steps, dry_run, logger))
 
 
 async def _replay_async(path: str, device: str, delay: float, start_from: int, max_steps: Optional[int], dry_run: bool, logger: logging.Logger):
@@ -7,9 +7,11 @@ import io
 import json
 import time
 import logging
+from collections import deque
 from llama_index.core.workflow import Context
 from droidrun.agent.utils.logging_utils import LoggingUtils
-from typing import Optional, Dict, Tuple, List, Any
+from droidrun.agent.utils.json_utils import json_loads
+from typing import Optional, Dict, Tuple, List, Any, Deque
 from droidrun.agent.common.events import (
     InputTextActionEvent,
     KeyPressActionEvent,
@@ -18,13 +20,79 @@ from droidrun.agent.common.events import (
     TapActionEvent,
     DragActionEvent,
 )
-from droidrun.tools.tools import Tools
+from droidrun.tools.tools import Tools, SessionPool
+from droidrun.config import get_config_manager
 from adbutils import adb
 import requests
-import base64
+import binascii
+
+try:
+    import pybase64
+except ImportError:  # pybase64 is an optional speedup, see the "speedups" extra
+    pybase64 = None
 
 logger = logging.getLogger("droidrun-tools")
 PORTAL_DEFAULT_TCP_PORT = 8080
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Request body skeleton for /keyboard/input: {"base64_text": "<base64>"}
+KEYBOARD_INPUT_PREFIX = b'{"base64_text":"'
+
+# Display names for the common keycodes accepted by press_key
+KEY_NAMES = {
+    66: "ENTER",
+    4: "BACK",
+    3: "HOME",
+    67: "DELETE",
+}
+
+
+def _b64encode_text(text: str) -> str:
+    """Base64-encode text for the portal keyboard."""
+    data = text.encode()
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    # b2a_base64 is the C routine behind base64.b64encode, minus the wrapper
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    """Decode a base64 payload such as a TCP screenshot, without strict validation."""
+    if pybase64 is not None:
+        return pybase64.b64decode(data, validate=False)
+    # a2b_base64 reads the ASCII str buffer directly, avoiding the full-size
+    # copy base64.b64decode makes
+    return binascii.a2b_base64(data)
+
+
+def _prepare_a11y_tree(elements: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """
+    Strip "type" keys and map each element index to its element in one walk.
+
+    "type" is removed in place from top-level elements and their direct
+    children. The index map covers the whole tree; it is built in pre-order
+    and the first element wins when an index repeats, matching a recursive
+    depth-first search.
+
+    Args:
+        elements: Top-level a11y tree elements, modified in place
+
+    Returns:
+        Dictionary of index to element
+    """
+    index_map: Dict[int, Dict[str, Any]] = {}
+    stack = [(element, 0) for element in reversed(elements)]
+    while stack:
+        element, depth = stack.pop()
+        if depth < 2:
+            element.pop("type", None)
+        index = element.get("index")
+        if index is not None and index not in index_map:
+            index_map[index] = element
+        children = element.get("children")
+        if children:
+            stack.extend((child, depth + 1) for child in reversed(children))
+    return index_map
 
 
 class AdbTools(Tools):
@@ -35,6 +103,7 @@ class AdbTools(Tools):
         serial: str | None = None,
         use_tcp: bool = False,
         remote_tcp_port: int = PORTAL_DEFAULT_TCP_PORT,
+        screenshot_history: Optional[int] = None,
     ) -> None:
         """Initialize the AdbTools instance.
 
@@ -42,23 +111,33 @@ class AdbTools(Tools):
             serial: Device serial number
             use_tcp: Whether to use TCP communication (default: False)
             tcp_port: TCP port for communication (default: 8080)
+            screenshot_history: Number of recent screenshots kept in memory
+                (default: tools.screenshot_history from the unified config)
         """
         self.device = adb.device(serial=serial)
         self.use_tcp = use_tcp
         self.remote_tcp_port = remote_tcp_port
         self.tcp_forwarded = False
+        # Keep-alive connection pool for portal requests over the forwarded port
+        self._http = SessionPool()
 
         self._ctx = None
         # Instance‐level cache for clickable elements (index-based tapping)
         self.clickable_elements_cache: List[Dict[str, Any]] = []
+        # Package -> launcher activity resolved by start_app, cleared on install
+        self._launch_activities: Dict[str, str] = {}
+        # Index -> element lookup for clickable_elements_cache, rebuilt with it
+        self._index_map: Dict[int, Dict[str, Any]] = {}
         self.last_screenshot = None
         self.reason = None
         self.success = None
         self.finished = False
         # Memory storage for remembering important information
         self.memory: List[str] = []
-        # Store all screenshots with timestamps
-        self.screenshots: List[Dict[str, Any]] = []
+        if screenshot_history is None:
+            screenshot_history = get_config_manager().get_tools_config().screenshot_history
+        # Store the most recent screenshots with timestamps (oldest are evicted)
+        self.screenshots: Deque[Dict[str, Any]] = deque(maxlen=screenshot_history)
         # Trajectory saving level
         self.save_trajectories = "none"
 
@@ -89,7 +168,7 @@ class AdbTools(Tools):
 
             # Test the connection with a ping
             try:
-                response = requests.get(f"{self.tcp_base_url}/ping", timeout=5)
+                response = self._http.get(f"{self.tcp_base_url}/ping", timeout=5)
                 if response.status_code == 200:
                     logger.debug("TCP connection test successful")
                     self.tcp_forwarded = True
@@ -125,6 +204,8 @@ class AdbTools(Tools):
                 LoggingUtils.log_debug("ADBTools", "Removing TCP port forwarding: {cmd}", cmd=cmd)
                 c = self.device.open_transport(cmd)
                 c.close()
+                # Pooled connections pointed at the removed forward are now dead
+                self._http.close()
 
                 self.tcp_forwarded = False
                 logger.debug(f"TCP port forwarding removed")
@@ -187,7 +268,7 @@ class AdbTools(Tools):
 
                 try:
                     # Parse the JSON string
-                    json_data = json.loads(json_str)
+                    json_data = json_loads(json_str)
                     return json_data
                 except json.JSONDecodeError:
                     continue
@@ -195,14 +276,14 @@ class AdbTools(Tools):
             # Fallback: try to parse lines that start with { or [
             elif line.startswith("{") or line.startswith("["):
                 try:
-                    json_data = json.loads(line)
+                    json_data = json_loads(line)
                     return json_data
                 except json.JSONDecodeError:
                     continue
 
         # If no valid JSON found in individual lines, try the entire output
         try:
-            json_data = json.loads(raw_output.strip())
+            json_data = json_loads(raw_output.strip())
             return json_data
         except json.JSONDecodeError:
             return None
@@ -221,41 +302,17 @@ class AdbTools(Tools):
         Returns:
             Result message
         """
-
-        def collect_all_indices(elements):
-            """Recursively collect all indices from elements and their children."""
-            indices = []
-            for item in elements:
-                if item.get("index") is not None:
-                    indices.append(item.get("index"))
-                # Check children if present
-                children = item.get("children", [])
-                indices.extend(collect_all_indices(children))
-            return indices
-
-        def find_element_by_index(elements, target_index):
-            """Recursively find an element with the given index."""
-            for item in elements:
-                if item.get("index") == target_index:
-                    return item
-                # Check children if present
-                children = item.get("children", [])
-                result = find_element_by_index(children, target_index)
-                if result:
-                    return result
-            return None
-
         try:
             # Check if we have cached elements
             if not self.clickable_elements_cache:
                 return "Error: No UI elements cached. Call get_state first."
 
             # Find the element with the given index (including in children)
-            element = find_element_by_index(self.clickable_elements_cache, index)
+            element = self._index_map.get(index)
 
             if not element:
                 # List available indices to help the user
-                indices = sorted(collect_all_indices(self.clickable_elements_cache))
+                indices = sorted(self._index_map)
                 indices_str = ", ".join(str(idx) for idx in indices[:20])
                 if len(indices) > 20:
                     indices_str += f"... and {len(indices) - 20} more"
@@ -281,7 +338,7 @@ class AdbTools(Tools):
             y = (top + bottom) // 2
 
             logger.debug(
-                f"Tapping element with index {index} at coordinates ({x}, {y})"
+                "Tapping element with index %s at coordinates (%s, %s)", index, x, y
             )
             # Get the device and tap at the coordinates
             self.device.click(x, y)
@@ -405,7 +462,8 @@ class AdbTools(Tools):
             self.device.swipe(start_x, start_y, end_x, end_y, float(duration_ms / 1000))
             time.sleep(duration_ms / 1000)
             logger.debug(
-                f"Swiped from ({start_x}, {start_y}) to ({end_x}, {end_y}) in {duration_ms} milliseconds"
+                "Swiped from (%s, %s) to (%s, %s) in %s milliseconds",
+                start_x, start_y, end_x, end_y, duration_ms,
             )
             return True
         except ValueError as e:
@@ -429,7 +487,8 @@ class AdbTools(Tools):
         """
         try:
             logger.debug(
-                f"Dragging from ({start_x}, {start_y}) to ({end_x}, {end_y}) in {duration} seconds"
+                "Dragging from (%s, %s) to (%s, %s) in %s seconds",
+                start_x, start_y, end_x, end_y, duration,
             )
             self.device.drag(start_x, start_y, end_x, end_y, duration)
 
@@ -447,7 +506,8 @@ class AdbTools(Tools):
 
             time.sleep(duration)
             logger.debug(
-                f"Dragged from ({start_x}, {start_y}) to ({end_x}, {end_y}) in {duration} seconds"
+                "Dragged from (%s, %s) to (%s, %s) in %s seconds",
+                start_x, start_y, end_x, end_y, duration,
             )
             return True
         except ValueError as e:
@@ -467,22 +527,26 @@ class AdbTools(Tools):
             Result message
         """
         try:
+            preview = f"{text[:50]}{'...' if len(text) > 50 else ''}"
 
             if self.use_tcp and self.tcp_forwarded:
                 # Use TCP communication
-                encoded_text = base64.b64encode(text.encode()).decode()
+                encoded_text = _b64encode_text(text)
 
-                payload = {"base64_text": encoded_text}
-                response = requests.post(
+                # Base64 needs no JSON escaping, so splice it into a fixed body
+                response = self._http.post(
                     f"{self.tcp_base_url}/keyboard/input",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
+                    data=KEYBOARD_INPUT_PREFIX + encoded_text.encode("ascii") + b'"}',
+                    headers=JSON_HEADERS,
                     timeout=10,
                 )
 
-                logger.debug(
-                     f"Keyboard input TCP response: {response.status_code}, {response.text}"
-                )
+                # response.text decodes the body, so only touch it when debugging
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Keyboard input TCP response: %s, %s",
+                        response.status_code, response.text,
+                    )
 
                 if response.status_code != 200:
                     return f"Error: HTTP request failed with status {response.status_code}: {response.text}"
@@ -490,7 +554,7 @@ class AdbTools(Tools):
             else:
                 # Fallback to content provider method
                 # Encode the text to Base64
-                encoded_text = base64.b64encode(text.encode()).decode()
+                encoded_text = _b64encode_text(text)
 
                 cmd = f'content insert --uri "content://com.droidrun.portal/keyboard/input" --bind base64_text:s:"{encoded_text}"'
                 self.device.shell(cmd)
@@ -498,15 +562,14 @@ class AdbTools(Tools):
             if self._ctx:
                 input_event = InputTextActionEvent(
                     action_type="input_text",
-                    description=f"Input text: '{text[:50]}{'...' if len(text) > 50 else ''}'",
+                    description=f"Input text: '{preview}'",
                     text=text,
                 )
                 self._ctx.write_event_to_stream(input_event)
 
-            logger.debug(
-                f"Text input completed: {text[:50]}{'...' if len(text) > 50 else ''}"
-            )
-            return f"Text input completed: {text[:50]}{'...' if len(text) > 50 else ''}"
+            message = f"Text input completed: {preview}"
+            logger.debug(message)
+            return message
 
         except requests.exceptions.RequestException as e:
             return f"Error: TCP request failed: {str(e)}"
@@ -553,13 +616,7 @@ class AdbTools(Tools):
             keycode: Android keycode to press
         """
         try:
-            key_names = {
-                66: "ENTER",
-                4: "BACK",
-                3: "HOME",
-                67: "DELETE",
-            }
-            key_name = key_names.get(keycode, str(keycode))
+            key_name = KEY_NAMES.get(keycode, str(keycode))
 
             if self._ctx:
                 key_event = KeyPressActionEvent(
@@ -577,6 +634,22 @@ class AdbTools(Tools):
         except ValueError as e:
             return f"Error: {str(e)}"
 
+    def _resolve_launch_activity(self, package: str) -> str:
+        """Resolve and cache the launcher activity of a package."""
+        dumpsys_output = self.device.shell(
+            f"cmd package resolve-activity --brief {package}"
+        )
+        activity = dumpsys_output.splitlines()[1].split("/")[1]
+        self._launch_activities[package] = activity
+        return activity
+
+    def _app_start(self, package: str, activity: str) -> None:
+        """Launch package/activity, raising if am start reports an error."""
+        # adbutils' app_start discards the output, which hides a missing activity
+        output = self.device.shell(["am", "start", "-n", f"{package}/{activity}"])
+        if "Error:" in output:
+            raise ValueError(output.strip())
+
     @Tools.ui_action
     def start_app(self, package: str, activity: str | None = None) -> str:
         """
@@ -590,11 +663,11 @@ class AdbTools(Tools):
 
             LoggingUtils.log_debug("ADBTools", "Starting app {package} with activity {activity}", 
                                  package=package, activity=activity)
+            cached_activity = None
             if not activity:
-                dumpsys_output = self.device.shell(
-                    f"cmd package resolve-activity --brief {package}"
-                )
-                activity = dumpsys_output.splitlines()[1].split("/")[1]
+                activity = cached_activity = self._launch_activities.get(package)
+            if not activity:
+                activity = self._resolve_launch_activity(package)
 
             if self._ctx:
                 start_app_event = StartAppEvent(
@@ -607,7 +680,16 @@ class AdbTools(Tools):
 
             print(f"Activity: {activity}")
 
-            self.device.app_start(package, activity)
+            try:
+                self._app_start(package, activity)
+            except Exception:
+                if not cached_activity:
+                    raise
+                # The app may have been updated outside install_app with a new
+                # launcher activity; drop the cached one and resolve it once more
+                self._launch_activities.pop(package, None)
+                activity = self._resolve_launch_activity(package)
+                self._app_start(package, activity)
             LoggingUtils.log_debug("ADBTools", "App started: {package} with activity {activity}", 
                                  package=package, activity=activity)
             return f"App started: {package} with activity {activity}"
@@ -639,6 +721,8 @@ class AdbTools(Tools):
                 flags=["-g"] if grant_permissions else [],
                 silent=True,
             )
+            # An installed or updated package may declare a new launcher activity
+            self._launch_activities.clear()
             LoggingUtils.log_debug("ADBTools", "Installed app: {path} with result: {result}", 
                                  path=apk_path, result=result)
             return result
@@ -665,15 +749,15 @@ class AdbTools(Tools):
                 if not hide_overlay:
                     url += "?hideOverlay=false"
                 
-                response = requests.get(url, timeout=10)
+                response = self._http.get(url, timeout=10)
                 if response.status_code == 200:
-                    tcp_response = response.json()
+                    tcp_response = json_loads(response.content)
                     
                     # Check if response has the expected format with data field
                     if tcp_response.get("status") == "success" and "data" in tcp_response:
                         # Decode base64 string to bytes
                         base64_data = tcp_response["data"]
-                        image_bytes = base64.b64decode(base64_data)
+                        image_bytes = _b64decode(base64_data)
                         logger.debug("Screenshot taken via TCP")
                     else:
                         # Handle error response from server
@@ -683,11 +767,14 @@ class AdbTools(Tools):
                     raise ValueError(f"Error taking screenshot via TCP: {response.status_code}")
 
             else:
-                # Fallback to ADB screenshot method
-                img = self.device.screenshot()
-                img_buf = io.BytesIO()
-                img.save(img_buf, format=img_format)
-                image_bytes = img_buf.getvalue()
+                # Fallback to ADB screenshot method. screencap already produces a PNG,
+                # so use its bytes as-is instead of decoding and re-encoding them.
+                image_bytes = self.device.shell("screencap -p", encoding=None)
+                if not isinstance(image_bytes, bytes) or not image_bytes.startswith(PNG_SIGNATURE):
+                    img = self.device.screenshot()
+                    img_buf = io.BytesIO()
+                    img.save(img_buf, format=img_format)
+                    image_bytes = img_buf.getvalue()
                 logger.debug("Screenshot taken via ADB")
 
             # Store screenshot with timestamp
@@ -795,16 +882,16 @@ class AdbTools(Tools):
 
             if self.use_tcp and self.tcp_forwarded:
                 # Use TCP communication
-                response = requests.get(f"{self.tcp_base_url}/state", timeout=10)
+                response = self._http.get(f"{self.tcp_base_url}/state", timeout=10)
 
                 if response.status_code == 200:
-                    tcp_response = response.json()
+                    tcp_response = json_loads(response.content)
 
                     # Check if response has the expected format
                     if isinstance(tcp_response, dict) and "data" in tcp_response:
                         data_str = tcp_response["data"]
                         try:
-                            combined_data = json.loads(data_str)
+                            combined_data = json_loads(data_str)
                         except json.JSONDecodeError:
                             return {
                                 "error": "Parse Error",
@@ -839,7 +926,7 @@ class AdbTools(Tools):
                     
                     if data_str:
                         try:
-                            combined_data = json.loads(data_str)
+                            combined_data = json_loads(data_str)
                         except json.JSONDecodeError:
                             return {
                                 "error": "Parse Error",
@@ -869,22 +956,11 @@ class AdbTools(Tools):
                     "message": "phone_state not found in combined state data",
                 }
 
-            # Filter out the "type" attribute from all a11y_tree elements
-            elements = combined_data["a11y_tree"]
-            filtered_elements = []
-            for element in elements:
-                # Create a copy of the element without the "type" attribute
-                filtered_element = {k: v for k, v in element.items() if k != "type"}
-
-                # Also filter children if present
-                if "children" in filtered_element:
-                    filtered_element["children"] = [
-                        {k: v for k, v in child.items() if k != "type"}
-                        for child in filtered_element["children"]
-                    ]
-
-                filtered_elements.append(filtered_element)
-
+            # Filter out the "type" attribute from all a11y_tree elements.
+            # The tree was just decoded and is not shared, so strip it in place
+            # and index it in the same pass instead of rebuilding every dict.
+            filtered_elements = combined_data["a11y_tree"]
+            self._index_map = _prepare_a11y_tree(filtered_elements)
             self.clickable_elements_cache = filtered_elements
 
             return {
@@ -912,7 +988,7 @@ class AdbTools(Tools):
         """
         try:
             if self.use_tcp and self.tcp_forwarded:
-                response = requests.get(f"{self.tcp_base_url}/ping", timeout=5)
+                response = self._http.get(f"{self.tcp_base_url}/ping", timeout=5)
 
                 if response.status_code == 200:
                     try:
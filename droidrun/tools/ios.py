@@ -4,13 +4,26 @@ UI Actions - Core UI interaction tools for iOS device control.
 
 import re
 import time
-from typing import Optional, Dict, Tuple, List, Any
+from collections import deque
+from typing import Optional, Dict, Tuple, List, Any, Deque
 import logging
 import requests
-from droidrun.tools.tools import Tools
+from droidrun.agent.utils.json_utils import json_loads
+from droidrun.tools.tools import Tools, SessionPool
+from droidrun.config import get_config_manager
 
 logger = logging.getLogger("IOS")
 
+# Patterns for lines of the iOS accessibility tree, e.g.
+# "Button, {{x, y}, {width, height}}, label: 'OK'"
+_COORDS_RE = re.compile(r"\{\{([0-9.]+),\s*([0-9.]+)\},\s*\{([0-9.]+),\s*([0-9.]+)\}\}")
+_ELEMENT_TYPE_RE = re.compile(r"\s*(.+?),")
+_LEADING_ARROWS_RE = re.compile(r"^[→\s]+")
+_LABEL_RE = re.compile(r"label:\s*'([^']*)'")
+_IDENTIFIER_RE = re.compile(r"identifier:\s*'([^']*)'")
+_PLACEHOLDER_RE = re.compile(r"placeholderValue:\s*'([^']*)'")
+_VALUE_RE = re.compile(r"value:\s*([^,}]+)")
+
 SYSTEM_BUNDLE_IDENTIFIERS = [
     "ai.droidrun.droidrun-ios-portal",
     "com.apple.Bridge",
@@ -37,21 +50,34 @@ SYSTEM_BUNDLE_IDENTIFIERS = [
 class IOSTools(Tools):
     """Core UI interaction tools for iOS device control."""
 
-    def __init__(self, url: str, bundle_identifiers: List[str] = []) -> None:
+    def __init__(
+        self,
+        url: str,
+        bundle_identifiers: List[str] = [],
+        screenshot_history: Optional[int] = None,
+    ) -> None:
         """Initialize the IOSTools instance.
 
         Args:
             url: iOS device URL. This is the URL of the iOS device. It is used to send requests to the iOS device.
             bundle_identifiers: List of bundle identifiers to include in the list of packages
+            screenshot_history: Number of recent screenshots kept in memory
+                (default: tools.screenshot_history from the unified config)
         """
         self.clickable_elements_cache: List[Dict[str, Any]] = []
+        # Index -> element lookup for clickable_elements_cache, rebuilt with it
+        self._index_map: Dict[int, Dict[str, Any]] = {}
         self.url = url
+        # Keep-alive connection pool for requests to the iOS portal
+        self._http = SessionPool()
         self.last_screenshot = None
         self.reason = None
         self.success = None
         self.finished = False
         self.memory: List[str] = []
-        self.screenshots: List[Dict[str, Any]] = []
+        if screenshot_history is None:
+            screenshot_history = get_config_manager().get_tools_config().screenshot_history
+        self.screenshots: Deque[Dict[str, Any]] = deque(maxlen=screenshot_history)
         self.last_tapped_rect: Optional[str] = (
             None  # Store last tapped element's rect for text input
         )
@@ -67,18 +93,20 @@ class IOSTools(Tools):
         """
         try:
             a11y_url = f"{self.url}/vision/a11y"
-            response = requests.get(a11y_url)
+            response = self._http.get(a11y_url)
 
             if response.status_code == 200:
-                a11y_data = response.json()
+                a11y_data = json_loads(response.content)
 
                 # Parse the iOS accessibility tree format
                 elements = self._parse_ios_accessibility_tree(
                     a11y_data["accessibilityTree"]
                 )
 
-                # Cache the elements for tap_by_index usage
+                # Cache the elements for tap_by_index usage; parsed elements
+                # are flat and numbered sequentially, so a dict lookup suffices
                 self.clickable_elements_cache = elements
+                self._index_map = {element["index"]: element for element in elements}
 
                 return {
                     "a11y_tree": self.clickable_elements_cache,
@@ -125,15 +153,13 @@ class IOSTools(Tools):
 
             # Parse UI elements - look for lines with coordinates
             # Format: ElementType, {{x, y}, {width, height}}, [optional properties]
-            coord_match = re.search(
-                r"\{\{([0-9.]+),\s*([0-9.]+)\},\s*\{([0-9.]+),\s*([0-9.]+)\}\}", line
-            )
+            coord_match = _COORDS_RE.search(line)
 
             if coord_match:
                 x, y, width, height = map(float, coord_match.groups())
 
                 # Extract element type (the text before the first comma)
-                element_type_match = re.match(r"\s*(.+?),", line)
+                element_type_match = _ELEMENT_TYPE_RE.match(line)
                 element_type = (
                     element_type_match.group(1).strip()
                     if element_type_match
@@ -141,22 +167,22 @@ class IOSTools(Tools):
                 )
 
                 # Remove leading arrows and spaces
-                element_type = re.sub(r"^[→\s]+", "", element_type)
+                element_type = _LEADING_ARROWS_RE.sub("", element_type)
 
                 # Extract label if present
-                label_match = re.search(r"label:\s*'([^']*)'", line)
+                label_match = _LABEL_RE.search(line)
                 label = label_match.group(1) if label_match else ""
 
                 # Extract identifier if present
-                identifier_match = re.search(r"identifier:\s*'([^']*)'", line)
+                identifier_match = _IDENTIFIER_RE.search(line)
                 identifier = identifier_match.group(1) if identifier_match else ""
 
                 # Extract placeholder value if present
-                placeholder_match = re.search(r"placeholderValue:\s*'([^']*)'", line)
+                placeholder_match = _PLACEHOLDER_RE.search(line)
                 placeholder = placeholder_match.group(1) if placeholder_match else ""
 
                 # Extract value if present
-                value_match = re.search(r"value:\s*([^,}]+)", line)
+                value_match = _VALUE_RE.search(line)
                 value = value_match.group(1).strip() if value_match else ""
 
                 # Calculate rect string for iOS tap API (x,y,width,height format)
@@ -216,35 +242,18 @@ class IOSTools(Tools):
         Returns:
             Result message
         """
-
-        def find_element_by_index(elements, target_index):
-            """Find an element with the given index."""
-            for item in elements:
-                if item.get("index") == target_index:
-                    return item
-                # Check children if present
-                children = item.get("children", [])
-                result = find_element_by_index(children, target_index)
-                if result:
-                    return result
-            return None
-
         try:
             # Check if we have cached elements
             if not self.clickable_elements_cache:
                 return "Error: No UI elements cached. Call get_clickables first."
 
             # Find the element with the given index
-            element = find_element_by_index(self.clickable_elements_cache, index)
+            element = self._index_map.get(index)
 
             if not element:
                 # List available indices to help the user
-                indices = [
-                    elem.get("index")
-                    for elem in self.clickable_elements_cache
-                    if elem.get("index") is not None
-                ]
-                indices_str = ", ".join(str(idx) for idx in sorted(indices)[:20])
+                indices = sorted(self._index_map)
+                indices_str = ", ".join(str(idx) for idx in indices[:20])
                 if len(indices) > 20:
                     indices_str += f"... and {len(indices) - 20} more"
 
@@ -275,7 +284,7 @@ class IOSTools(Tools):
 
             logger.info(f"payload {payload}")
 
-            response = requests.post(tap_url, json=payload)
+            response = self._http.post(tap_url, json=payload)
             if response.status_code == 200:
                 # Add a small delay to allow UI to update
                 time.sleep(0.5)
@@ -308,7 +317,7 @@ class IOSTools(Tools):
 
         logger.info(f"payload {payload}")
 
-        response = requests.post(tap_url, json=payload)
+        response = self._http.post(tap_url, json=payload)
         if response.status_code == 200:
             return True
         else:
@@ -358,7 +367,7 @@ class IOSTools(Tools):
             swipe_url = f"{self.url}/gestures/swipe"
             payload = {"x": float(start_x), "y": float(start_y), "dir": direction}
 
-            response = requests.post(swipe_url, json=payload)
+            response = self._http.post(swipe_url, json=payload)
             if response.status_code == 200:
                 logger.info(
                     f"Swiped from ({start_x}, {start_y}) to ({end_x}, {end_y}) direction: {direction}"
@@ -407,7 +416,7 @@ class IOSTools(Tools):
             type_url = f"{self.url}/inputs/type"
             payload = {"rect": rect, "text": text}
 
-            response = requests.post(type_url, json=payload)
+            response = self._http.post(type_url, json=payload)
             if response.status_code == 200:
                 time.sleep(0.5)  # Wait for text input to complete
                 return f"Text input completed: {text[:50]}{'...' if len(text) > 50 else ''}"
@@ -440,7 +449,7 @@ class IOSTools(Tools):
             key_url = f"{self.url}/inputs/key"
             payload = {"key": keycode}
 
-            response = requests.post(key_url, json=payload)
+            response = self._http.post(key_url, json=payload)
             if response.status_code == 200:
                 return f"Pressed key {key_name}"
             else:
@@ -461,7 +470,7 @@ class IOSTools(Tools):
             launch_url = f"{self.url}/inputs/launch"
             payload = {"bundleIdentifier": package}
 
-            response = requests.post(launch_url, json=payload)
+            response = self._http.post(launch_url, json=payload)
             if response.status_code == 200:
                 time.sleep(1.0)  # Wait for app to launch
                 return f"Successfully launched app: {package}"
@@ -479,7 +488,7 @@ class IOSTools(Tools):
         """
         try:
             screenshot_url = f"{self.url}/vision/screenshot"
-            response = requests.get(screenshot_url)
+            response = self._http.get(screenshot_url)
 
             if response.status_code == 200:
                 screenshot_data = response.content
@@ -518,10 +527,10 @@ class IOSTools(Tools):
         try:
             # For iOS, we can get some state info from the accessibility API
             a11y_url = f"{self.url}/vision/state"
-            response = requests.get(a11y_url)
+            response = self._http.get(a11y_url)
 
             if response.status_code == 200:
-                state_data = response.json()
+                state_data = json_loads(response.content)
 
                 return {
                     "current_activity": state_data["activity"],
@@ -3,12 +3,52 @@ from typing import List, Optional, Dict, Any
 import logging
 from typing import Tuple, Dict, Callable, Any, Optional
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 import sys
+import threading
+import requests
 
 # Get a logger for this module
 logger = logging.getLogger(__name__)
 
 
+class SessionPool:
+    """
+    Keep-alive HTTP sessions shared by all threads of one tools instance.
+
+    requests.Session is not documented as thread-safe, so each request borrows
+    an idle session (opening one if none is free) and returns it afterwards.
+    The pool only grows to the peak number of concurrent requests.
+    """
+
+    def __init__(self) -> None:
+        self._idle: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request on a borrowed session; the response body is fully read."""
+        with self._lock:
+            session = self._idle.pop() if self._idle else requests.Session()
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            with self._lock:
+                self._idle.append(session)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """Close the idle sessions and their pooled connections."""
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+
 class Tools(ABC):
     """
     Abstract base class for all tools.
@@ -33,13 +73,37 @@ class Tools(ABC):
                 step_screenshots = caller_globals.get('step_screenshots')
                 step_ui_states = caller_globals.get('step_ui_states')
                 
-                if step_screenshots is not None:
+                if step_screenshots is not None and step_ui_states is not None:
+                    # Both are independent device round trips; run them concurrently.
+                    # get_state refreshes the element cache even if the screenshot
+                    # fails (intended: the cache follows the post-action screen), but
+                    # the step is only recorded once both captures have succeeded.
+                    screenshot_future = self._get_capture_executor().submit(self.take_screenshot)
+                    try:
+                        ui_state = self.get_state()
+                    finally:
+                        screenshot = screenshot_future.result()[1]
+                    step_screenshots.append(screenshot)
+                    step_ui_states.append(ui_state)
+                elif step_screenshots is not None:
                     step_screenshots.append(self.take_screenshot()[1])
-                if step_ui_states is not None:
+                elif step_ui_states is not None:
                     step_ui_states.append(self.get_state())
             return result
         return wrapper
 
+    def _get_capture_executor(self) -> ThreadPoolExecutor:
+        """
+        Return this instance's worker for overlapping the post-action screenshot
+        with the UI state fetch, so devices in one process never queue behind
+        each other's captures.
+        """
+        executor = getattr(self, "_capture_executor", None)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-action-capture")
+            self._capture_executor = executor
+        return executor
+
     @abstractmethod
     def get_state(self) -> Dict[str, Any]:
         """